@@ -5,19 +5,21 @@ Demonstrates how to use the Reconnaissance Agent for subdomain enumeration.
 """
 
 import logging
-from reconnaissance_agent import ReconnaissanceAgent
+from reconnaissance_agent import get_reconnaissance_agent
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+BANNER = "=" * 50
+
 
 def example_passive_enumeration():
     """Example of passive subdomain enumeration."""
     logger.info("=== Passive Subdomain Enumeration Example ===")
     
-    # Create the reconnaissance agent
-    recon_agent = ReconnaissanceAgent()
+    # Get the shared reconnaissance agent (its MCP connection is reused)
+    recon_agent = get_reconnaissance_agent()
     
     # Target domain (replace with actual domain for testing)
     target_domain = "example.com"
@@ -34,7 +36,7 @@ def example_passive_enumeration():
         return result
         
     except Exception as e:
-        logger.error(f"Passive enumeration failed: {e}")
+        logger.error("Passive enumeration failed: %s", e)
         return None
 
 
@@ -42,8 +44,8 @@ def example_active_enumeration():
     """Example of active subdomain enumeration."""
     logger.info("=== Active Subdomain Enumeration Example ===")
     
-    # Create the reconnaissance agent
-    recon_agent = ReconnaissanceAgent()
+    # Get the shared reconnaissance agent (its MCP connection is reused)
+    recon_agent = get_reconnaissance_agent()
     
     # Target domain (replace with actual domain for testing)
     target_domain = "example.com"
@@ -61,7 +63,7 @@ def example_active_enumeration():
         return result
         
     except Exception as e:
-        logger.error(f"Active enumeration failed: {e}")
+        logger.error("Active enumeration failed: %s", e)
         return None
 
 
@@ -69,8 +71,8 @@ def example_comprehensive_reconnaissance():
     """Example of comprehensive reconnaissance (passive + active + intel)."""
     logger.info("=== Comprehensive Reconnaissance Example ===")
     
-    # Create the reconnaissance agent
-    recon_agent = ReconnaissanceAgent()
+    # Get the shared reconnaissance agent (its MCP connection is reused)
+    recon_agent = get_reconnaissance_agent()
     
     # Target domain (replace with actual domain for testing)
     target_domain = "example.com"
@@ -90,7 +92,7 @@ def example_comprehensive_reconnaissance():
         return result
         
     except Exception as e:
-        logger.error(f"Comprehensive reconnaissance failed: {e}")
+        logger.error("Comprehensive reconnaissance failed: %s", e)
         return None
 
 
@@ -98,8 +100,8 @@ def example_custom_configuration():
     """Example using custom configuration."""
     logger.info("=== Custom Configuration Example ===")
     
-    # Create the reconnaissance agent
-    recon_agent = ReconnaissanceAgent()
+    # Get the shared reconnaissance agent (its MCP connection is reused)
+    recon_agent = get_reconnaissance_agent()
     
     # Target domain (replace with actual domain for testing)
     target_domain = "example.com"
@@ -120,7 +122,7 @@ def example_custom_configuration():
         return result
         
     except Exception as e:
-        logger.error(f"Custom configuration reconnaissance failed: {e}")
+        logger.error("Custom configuration reconnaissance failed: %s", e)
         return None
 
 
@@ -128,15 +130,15 @@ def list_available_tools():
     """List all available MCP tools."""
     logger.info("=== Available MCP Tools ===")
     
-    # Create the reconnaissance agent
-    recon_agent = ReconnaissanceAgent()
+    # Get the shared reconnaissance agent (its MCP connection is reused)
+    recon_agent = get_reconnaissance_agent()
     
     # List available tools
     tools = recon_agent.list_available_tools()
     
     logger.info("Available MCP servers:")
     for name, description in tools.items():
-        logger.info(f"  - {name}: {description}")
+        logger.info("  - %s: %s", name, description)
     
     return tools
 
@@ -144,7 +146,7 @@ def list_available_tools():
 def main():
     """Main function demonstrating various usage examples."""
     print("Reconnaissance Agent - Example Usage")
-    print("=" * 50)
+    print(BANNER)
     
     # List available tools
     list_available_tools()
@@ -7,11 +7,29 @@ from typing import List, Optional, Dict, Any
 from crewai_tools import MCPServerAdapter
 from mcp import StdioServerParameters
 import logging
+import threading
+import weakref
 
 from .config import MCPConfigManager, MCPServerConfig
 
 logger = logging.getLogger(__name__)
 
+# Errors meaning an MCP server connection is broken, as opposed to a bad
+# request or an LLM failure that leaves the connection usable
+try:
+    import anyio
+    from mcp.shared.exceptions import McpError
+    CONNECTION_ERRORS = (OSError, EOFError, McpError, anyio.BrokenResourceError, anyio.ClosedResourceError)
+except ImportError:  # pragma: no cover - both ship with the MCP client
+    CONNECTION_ERRORS = (OSError, EOFError)
+
+
+def _stop_adapters(adapters: Dict[str, MCPServerAdapter]):
+    """Stop adapters still pooled when their manager is collected or at exit."""
+    while adapters:
+        _, adapter = adapters.popitem()
+        MCPManager._stop_adapter(adapter)
+
 
 class MCPManager:
     """Manages multiple MCP server connections."""
@@ -19,7 +37,12 @@ class MCPManager:
     def __init__(self, config_manager: Optional[MCPConfigManager] = None):
         self.config_manager = config_manager or MCPConfigManager()
         self.adapters: Dict[str, MCPServerAdapter] = {}
-        self._all_tools = []
+        self._tools: Dict[str, List[Any]] = {}
+        self._adapters_lock = threading.Lock()
+        # Stops whatever is still pooled when the manager is garbage-collected
+        # or the interpreter exits. It references the pool, not the manager,
+        # so it does not keep the manager alive.
+        weakref.finalize(self, _stop_adapters, self.adapters)
     
     def get_server_parameters(self, server_names: Optional[List[str]] = None) -> List[StdioServerParameters]:
         """Get StdioServerParameters for specified servers or all enabled servers."""
@@ -34,7 +57,7 @@ class MCPManager:
                 if config and config.enabled:
                     configs.append(config)
                 else:
-                    logger.warning(f"Server '{name}' not found or disabled")
+                    logger.warning("Server '%s' not found or disabled", name)
         
         # Filter for stdio servers only and create parameters
         stdio_params = []
@@ -60,6 +83,98 @@ class MCPManager:
             # For multiple servers, pass the list
             return MCPServerAdapter(server_params)
     
+    @staticmethod
+    def _adapter_key(server_names: Optional[List[str]]) -> str:
+        return ",".join(sorted(server_names)) if server_names is not None else "*"
+    
+    def get_adapter(self, server_names: Optional[List[str]] = None) -> MCPServerAdapter:
+        """
+        Get a connected MCPServerAdapter for the specified servers.
+        
+        Adapters are pooled per set of servers, so each MCP server process is
+        started and initialized once and then reused until it is closed.
+        """
+        key = self._adapter_key(server_names)
+        with self._adapters_lock:
+            adapter = self.adapters.get(key)
+            if adapter is None:
+                adapter = self.create_managed_adapter(server_names)
+                adapter.__enter__()
+                self.adapters[key] = adapter
+                # A server's tool list is fixed for the lifetime of its connection
+                self._tools[key] = [self._watch_tool(key, adapter, tool) for tool in adapter.tools]
+            return adapter
+    
+    def _watch_tool(self, key: str, adapter: MCPServerAdapter, tool: Any) -> Any:
+        """
+        Evict the pooled adapter when a call through this tool finds it broken.
+        
+        CrewAI catches tool errors during a crew run, so the failure has to be
+        noticed here for the next run to reconnect instead of reusing a dead
+        connection.
+        """
+        run = tool._run
+        
+        def _run(*args, **kwargs):
+            try:
+                return run(*args, **kwargs)
+            except CONNECTION_ERRORS as e:
+                logger.error("Lost connection to MCP servers: %s", e)
+                self._evict_adapter(key, adapter)
+                raise
+        
+        tool._run = _run
+        return tool
+    
+    def _evict_adapter(self, key: str, adapter: MCPServerAdapter):
+        """Drop a broken adapter from the pool, unless it was already replaced."""
+        with self._adapters_lock:
+            if self.adapters.get(key) is not adapter:
+                return
+            del self.adapters[key]
+            self._tools.pop(key, None)
+        self._stop_adapter(adapter)
+    
+    def get_tools(self, server_names: Optional[List[str]] = None) -> List[Any]:
+        """Get the tools of the pooled adapter for the specified servers."""
+        adapter = self.get_adapter(server_names)
+        with self._adapters_lock:
+            return self._tools.get(self._adapter_key(server_names)) or list(adapter.tools)
+    
+    def close_adapter(self, server_names: Optional[List[str]] = None):
+        """Disconnect the pooled adapter for the specified servers, if any."""
+        key = self._adapter_key(server_names)
+        with self._adapters_lock:
+            adapter = self.adapters.pop(key, None)
+            self._tools.pop(key, None)
+        if adapter:
+            self._stop_adapter(adapter)
+    
+    def __enter__(self):
+        """Enter context manager; pooled adapters are closed on exit."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Disconnect all pooled adapters, even when an error occurred."""
+        self.close_all()
+    
+    def close_all(self):
+        """Disconnect all pooled adapters."""
+        with self._adapters_lock:
+            adapters = list(self.adapters.values())
+            self.adapters.clear()
+            self._tools.clear()
+        for adapter in adapters:
+            self._stop_adapter(adapter)
+    
+    @staticmethod
+    def _stop_adapter(adapter: MCPServerAdapter):
+        try:
+            adapter.__exit__(None, None, None)
+            logger.info("Disconnected from MCP servers")
+        except Exception as e:
+            logger.error("Error disconnecting from MCP servers: %s", e)
+    
     def list_available_servers(self) -> Dict[str, str]:
         """List all available servers with their descriptions."""
         return self.config_manager.list_servers()
@@ -78,26 +193,26 @@ class ReconnaissanceMCPTools:
         self.tools = []
     
     def __enter__(self):
-        """Enter context manager to start MCP connections."""
+        """Enter context manager to obtain pooled MCP connections."""
         try:
-            # Create adapter for amass-mcp server specifically
-            self.adapter = self.mcp_manager.create_managed_adapter(["amass-mcp"])
-            self.adapter.__enter__()
-            self.tools = self.adapter.tools
-            logger.info(f"Connected to MCP servers. Available tools: {[tool.name for tool in self.tools]}")
+            # Use the pooled adapter for the amass-mcp server specifically
+            self.adapter = self.mcp_manager.get_adapter(["amass-mcp"])
+            self.tools = self.mcp_manager.get_tools(["amass-mcp"])
+            logger.info("Connected to MCP servers. Available tools: %s", [tool.name for tool in self.tools])
             return self.tools
         except Exception as e:
-            logger.error(f"Failed to connect to MCP servers: {e}")
+            logger.error("Failed to connect to MCP servers: %s", e)
             raise
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Exit context manager to clean up MCP connections."""
-        if self.adapter:
-            try:
-                self.adapter.__exit__(exc_type, exc_val, exc_tb)
-                logger.info("Disconnected from MCP servers")
-            except Exception as e:
-                logger.error(f"Error disconnecting from MCP servers: {e}")
+        """
+        Exit context manager.
+        
+        The connection stays pooled in the MCPManager for reuse; it is only
+        dropped when an error occurred, so the next use starts a fresh one.
+        """
+        if self.adapter and exc_type is not None:
+            self.mcp_manager.close_adapter(["amass-mcp"])
     
     def get_amass_tools(self) -> List[Any]:
         """Get tools specifically for Amass operations."""
@@ -7,19 +7,22 @@ This server provides tools for passive and active subdomain enumeration.
 
 import asyncio
 import json
-import sys
 from typing import Any, Dict, List, Optional
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import (
     Tool,
     TextContent,
-    CallToolRequest,
     CallToolResult,
 )
-import subprocess
 import logging
 import os
+import shutil
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -28,107 +31,259 @@ logger = logging.getLogger(__name__)
 # Global server instance
 server = Server("amass-mcp")
 
-@server.list_tools()
-async def list_tools() -> List[Tool]:
-    """List available Amass tools."""
-    return [
-        Tool(
-            name="amass_passive_enum",
-            description="Perform passive subdomain enumeration using Amass",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "domain": {
-                        "type": "string",
-                        "description": "Target domain for subdomain enumeration"
-                    },
-                    "config_file": {
-                        "type": "string",
-                        "description": "Optional path to Amass configuration file",
-                        "default": ""
-                    },
-                    "timeout": {
-                        "type": "integer",
-                        "description": "Timeout in seconds (default: 300)",
-                        "default": 300
-                    },
-                    "wordlist": {
-                        "type": "string",
-                        "description": "Optional wordlist file for enumeration",
-                        "default": ""
-                    }
+def _env_limit(name: str, default: int) -> int:
+    """Read a concurrency limit from the environment; it is always at least 1."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        limit = int(value)
+    except ValueError:
+        logger.warning("Ignoring invalid %s=%r; using %d", name, value, default)
+        return default
+    if limit < 1:
+        logger.warning("%s=%d would block every run; using 1", name, limit)
+        return 1
+    return limit
+
+# Active enumeration hammers DNS resolvers, so only a few runs may be in
+# flight at once regardless of how many targets the agent dispatches.
+MAX_CONCURRENT_ACTIVE_ENUMS = _env_limit("AMASS_MAX_ACTIVE_ENUMS", 2)
+_active_enum_semaphore = asyncio.Semaphore(MAX_CONCURRENT_ACTIVE_ENUMS)
+
+# Upper bound on Amass processes of any kind, so a burst of tool calls
+# cannot exhaust file descriptors or fork an unbounded number of processes.
+MAX_CONCURRENT_AMASS_RUNS = _env_limit("AMASS_MAX_PARALLEL", 4)
+_amass_semaphore = asyncio.Semaphore(MAX_CONCURRENT_AMASS_RUNS)
+
+# Tool definitions are static, so they are built once at import time
+# instead of on every tools/list request.
+AMASS_TOOLS: List[Tool] = [
+    Tool(
+        name="amass_passive_enum",
+        description="Perform passive subdomain enumeration using Amass",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "domain": {
+                    "type": "string",
+                    "description": "Target domain for subdomain enumeration"
                 },
-                "required": ["domain"]
-            }
-        ),
-        Tool(
-            name="amass_active_enum",
-            description="Perform active subdomain enumeration using Amass",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "domain": {
-                        "type": "string",
-                        "description": "Target domain for subdomain enumeration"
-                    },
-                    "config_file": {
-                        "type": "string",
-                        "description": "Optional path to Amass configuration file",
-                        "default": ""
-                    },
-                    "timeout": {
-                        "type": "integer",
-                        "description": "Timeout in seconds (default: 600)",
-                        "default": 600
-                    },
-                    "brute_force": {
-                        "type": "boolean",
-                        "description": "Enable brute force enumeration",
-                        "default": False
-                    },
-                    "wordlist": {
-                        "type": "string",
-                        "description": "Wordlist file for brute force enumeration",
-                        "default": ""
-                    }
+                "config_file": {
+                    "type": "string",
+                    "description": "Optional path to Amass configuration file",
+                    "default": ""
                 },
-                "required": ["domain"]
-            }
+                "timeout": {
+                    "type": "integer",
+                    "description": "Timeout in seconds (default: 300)",
+                    "default": 300
+                },
+                "wordlist": {
+                    "type": "string",
+                    "description": "Optional wordlist file for enumeration",
+                    "default": ""
+                }
+            },
+            "required": ["domain"]
+        }
+    ),
+    Tool(
+        name="amass_active_enum",
+        description="Perform active subdomain enumeration using Amass",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "domain": {
+                    "type": "string",
+                    "description": "Target domain for subdomain enumeration"
+                },
+                "config_file": {
+                    "type": "string",
+                    "description": "Optional path to Amass configuration file",
+                    "default": ""
+                },
+                "timeout": {
+                    "type": "integer",
+                    "description": "Timeout in seconds (default: 600)",
+                    "default": 600
+                },
+                "brute_force": {
+                    "type": "boolean",
+                    "description": "Enable brute force enumeration",
+                    "default": False
+                },
+                "wordlist": {
+                    "type": "string",
+                    "description": "Wordlist file for brute force enumeration",
+                    "default": ""
+                },
+                "max_dns_queries": {
+                    "type": "integer",
+                    "description": "Maximum number of concurrent DNS queries (0 uses the Amass default)",
+                    "default": 0
+                },
+                "resolvers_file": {
+                    "type": "string",
+                    "description": "Optional file of DNS resolver IPs to spread queries across",
+                    "default": ""
+                }
+            },
+            "required": ["domain"]
+        }
+    ),
+    Tool(
+        name="amass_intel",
+        description="Gather intelligence on domain using Amass",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "domain": {
+                    "type": "string",
+                    "description": "Target domain for intelligence gathering"
+                },
+                "whois": {
+                    "type": "boolean",
+                    "description": "Include WHOIS information",
+                    "default": True
+                },
+                "config_file": {
+                    "type": "string",
+                    "description": "Optional path to Amass configuration file",
+                    "default": ""
+                }
+            },
+            "required": ["domain"]
+        }
+    ),
+    Tool(
+        name="amass_full_recon",
+        description=(
+            "Run passive enumeration, intelligence gathering and optionally "
+            "active enumeration concurrently in a single call"
         ),
-        Tool(
-            name="amass_intel",
-            description="Gather intelligence on domain using Amass",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "domain": {
-                        "type": "string",
-                        "description": "Target domain for intelligence gathering"
-                    },
-                    "whois": {
-                        "type": "boolean",
-                        "description": "Include WHOIS information",
-                        "default": True
-                    },
-                    "config_file": {
-                        "type": "string",
-                        "description": "Optional path to Amass configuration file",
-                        "default": ""
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "domain": {
+                    "type": "string",
+                    "description": "Target domain for reconnaissance"
                 },
-                "required": ["domain"]
-            }
-        )
-    ]
+                "config_file": {
+                    "type": "string",
+                    "description": "Optional path to Amass configuration file",
+                    "default": ""
+                },
+                "active": {
+                    "type": "boolean",
+                    "description": "Also run active enumeration",
+                    "default": False
+                },
+                "passive_timeout": {
+                    "type": "integer",
+                    "description": "Passive enumeration timeout in seconds (default: 300)",
+                    "default": 300
+                },
+                "active_timeout": {
+                    "type": "integer",
+                    "description": "Active enumeration timeout in seconds (default: 600)",
+                    "default": 600
+                },
+                "brute_force": {
+                    "type": "boolean",
+                    "description": "Enable brute force during active enumeration",
+                    "default": False
+                },
+                "wordlist": {
+                    "type": "string",
+                    "description": "Wordlist file for brute force enumeration",
+                    "default": ""
+                },
+                "resolvers_file": {
+                    "type": "string",
+                    "description": "Optional file of DNS resolver IPs for active enumeration",
+                    "default": ""
+                },
+                "timeout": {
+                    "type": "integer",
+                    "description": "Overall time limit in seconds; unfinished phases are reported as failed (0: no limit)",
+                    "default": 0,
+                    "minimum": 0
+                },
+                "whois": {
+                    "type": "boolean",
+                    "description": "Include WHOIS information",
+                    "default": True
+                }
+            },
+            "required": ["domain"]
+        }
+    )
+]
+
+@server.list_tools()
+async def list_tools() -> List[Tool]:
+    """List available Amass tools."""
+    return AMASS_TOOLS
+
+async def _stop_process(process: asyncio.subprocess.Process, grace_period: float = 5.0):
+    """Terminate a process, killing it if it does not exit within the grace period."""
+    if process.returncode is not None:
+        return
+    
+    process.terminate()
+    try:
+        await asyncio.wait_for(process.wait(), timeout=grace_period)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+
+# Absolute path of the Amass binary, resolved on first use
+_amass_path = None
+
+def _resolve_amass() -> Optional[str]:
+    """Return the absolute path of the Amass binary, or None if it is not installed."""
+    global _amass_path
+    # Only a successful lookup is cached, so installing Amass while the
+    # server is running is picked up on the next call.
+    if _amass_path is None:
+        _amass_path = shutil.which("amass")
+    return _amass_path
+
+def _amass_not_found() -> Dict[str, Any]:
+    """Result returned when the Amass binary is not installed."""
+    return {
+        "success": False,
+        "error": "Amass command not found in PATH",
+        "subdomains": []
+    }
 
 async def run_amass_command(command: List[str], timeout: int = 300) -> Dict[str, Any]:
-    """Run an Amass command and return the results."""
+    """
+    Run an Amass command and return the results.
+    
+    At most MAX_CONCURRENT_AMASS_RUNS commands run at once. The timeout
+    covers the command itself, not the time spent waiting for a slot.
+    """
+    # Fail fast without waiting for a slot when Amass is not installed,
+    # and spawn by absolute path so each run skips the PATH search.
+    amass_path = _resolve_amass()
+    if amass_path is None:
+        return _amass_not_found()
+    command = [amass_path, *command[1:]]
+    
+    async with _amass_semaphore:
+        return await _execute_amass_command(command, timeout)
+
+async def _execute_amass_command(command: List[str], timeout: int) -> Dict[str, Any]:
     try:
-        logger.info(f"Running command: {' '.join(command)}")
+        logger.info("Running command: %s", " ".join(command))
         
-        # Run the command with timeout
+        # Run the command with timeout. stdin is detached because this
+        # server's own stdin carries the MCP protocol stream.
         process = await asyncio.create_subprocess_exec(
             *command,
+            stdin=asyncio.subprocess.DEVNULL,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE
         )
@@ -139,18 +294,22 @@ async def run_amass_command(command: List[str], timeout: int = 300) -> Dict[str,
                 timeout=timeout
             )
         except asyncio.TimeoutError:
-            process.kill()
-            await process.wait()
+            await _stop_process(process)
             return {
                 "success": False,
                 "error": f"Command timed out after {timeout} seconds",
                 "subdomains": []
             }
+        except asyncio.CancelledError:
+            # Do not leave Amass running when the caller gives up on it
+            await _stop_process(process)
+            raise
         
         # Process the output
         if process.returncode == 0:
             output = stdout.decode('utf-8').strip()
-            subdomains = [line.strip() for line in output.split('\n') if line.strip()]
+            # Amass can report the same name from several sources
+            subdomains = sorted({line.strip() for line in output.splitlines() if line.strip()})
             
             return {
                 "success": True,
@@ -167,122 +326,214 @@ async def run_amass_command(command: List[str], timeout: int = 300) -> Dict[str,
             }
             
     except Exception as e:
-        logger.error(f"Error running Amass command: {e}")
+        logger.error("Error running Amass command: %s", e)
         return {
             "success": False,
             "error": f"Exception occurred: {str(e)}",
             "subdomains": []
         }
 
+def _json_result(result: Dict[str, Any]) -> CallToolResult:
+    """Serialize a command result compactly for transfer to the LLM."""
+    if orjson is not None:
+        text = orjson.dumps(result).decode("utf-8")
+    else:
+        text = json.dumps(result, separators=(",", ":"))
+    
+    return CallToolResult(
+        content=[TextContent(
+            type="text",
+            text=text
+        )]
+    )
+
+async def run_passive_enum(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Run passive subdomain enumeration for a validated set of arguments."""
+    config_file = arguments.get("config_file", "")
+    timeout = arguments.get("timeout", 300)
+    wordlist = arguments.get("wordlist", "")
+    
+    # Build the Amass command for passive enumeration
+    command = ["amass", "enum", "-passive", "-d", arguments["domain"]]
+    
+    if config_file:
+        command.extend(["-config", config_file])
+    
+    if wordlist:
+        command.extend(["-w", wordlist])
+    
+    return await run_amass_command(command, timeout)
+
+async def run_active_enum(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Run active subdomain enumeration for a validated set of arguments."""
+    config_file = arguments.get("config_file", "")
+    timeout = arguments.get("timeout", 600)
+    brute_force = arguments.get("brute_force", False)
+    wordlist = arguments.get("wordlist", "")
+    max_dns_queries = arguments.get("max_dns_queries", 0)
+    resolvers_file = arguments.get("resolvers_file", "")
+    
+    # Build the Amass command for active enumeration
+    command = ["amass", "enum", "-active", "-d", arguments["domain"]]
+    
+    if config_file:
+        command.extend(["-config", config_file])
+    
+    if brute_force:
+        command.append("-brute")
+        if wordlist:
+            command.extend(["-w", wordlist])
+    
+    if max_dns_queries:
+        command.extend(["-max-dns-queries", str(max_dns_queries)])
+    
+    if resolvers_file:
+        command.extend(["-rf", resolvers_file])
+    
+    # Likewise fail fast before queueing for an active enumeration slot
+    if _resolve_amass() is None:
+        return _amass_not_found()
+    
+    async with _active_enum_semaphore:
+        return await run_amass_command(command, timeout)
+
+async def run_intel(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Run Amass intelligence gathering for a validated set of arguments."""
+    whois = arguments.get("whois", True)
+    config_file = arguments.get("config_file", "")
+    
+    # Build the Amass command for intelligence gathering
+    command = ["amass", "intel", "-d", arguments["domain"]]
+    
+    if whois:
+        command.append("-whois")
+    
+    if config_file:
+        command.extend(["-config", config_file])
+    
+    return await run_amass_command(command, 300)
+
+async def run_full_recon(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Run passive enumeration, intelligence and optionally active enumeration concurrently."""
+    domain = arguments["domain"]
+    config_file = arguments.get("config_file", "")
+    overall_timeout = arguments.get("timeout", 0)
+    
+    # Clients may skip schema validation, so do not assume an integer here
+    try:
+        valid_timeout = int(overall_timeout) >= 0
+    except (TypeError, ValueError):
+        valid_timeout = False
+    if not valid_timeout:
+        return {
+            "success": False,
+            "error": f"Invalid timeout: {overall_timeout!r} (must be a non-negative integer)",
+            "subdomains": []
+        }
+    overall_timeout = int(overall_timeout)
+    
+    phases = {
+        "passive": run_passive_enum({
+            "domain": domain,
+            "config_file": config_file,
+            "timeout": arguments.get("passive_timeout", 300)
+        }),
+        "intel": run_intel({
+            "domain": domain,
+            "config_file": config_file,
+            "whois": arguments.get("whois", True)
+        })
+    }
+    
+    if arguments.get("active", False):
+        phases["active"] = run_active_enum({
+            "domain": domain,
+            "config_file": config_file,
+            "timeout": arguments.get("active_timeout", 600),
+            "brute_force": arguments.get("brute_force", False),
+            "wordlist": arguments.get("wordlist", ""),
+            "resolvers_file": arguments.get("resolvers_file", "")
+        })
+    
+    # Phases run concurrently; an overall time limit cancels the unfinished
+    # ones while keeping the results of those that completed.
+    tasks = {phase: asyncio.ensure_future(coro) for phase, coro in phases.items()}
+    pending = set(tasks.values())
+    try:
+        _, pending = await asyncio.wait(tasks.values(), timeout=overall_timeout or None)
+    finally:
+        # Also runs when the caller cancels us, so no phase outlives this
+        # call and keeps its Amass process and semaphore slot.
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    
+    # One failing phase must not discard the results of the others
+    results = {}
+    for phase, task in tasks.items():
+        if task in pending:
+            results[phase] = {
+                "success": False,
+                "error": f"Phase did not finish within {overall_timeout} seconds",
+                "subdomains": []
+            }
+        elif task.exception() is not None:
+            logger.error("Amass %s phase failed: %s", phase, task.exception())
+            results[phase] = {
+                "success": False,
+                "error": f"Exception occurred: {str(task.exception())}",
+                "subdomains": []
+            }
+        else:
+            results[phase] = task.result()
+    
+    # Merge the enumeration phases so callers do not have to deduplicate
+    subdomains = set()
+    for phase in ("passive", "active"):
+        if phase in results:
+            subdomains.update(results[phase]["subdomains"])
+    
+    return {
+        "success": all(result["success"] for result in results.values()),
+        "successful_phases": [phase for phase, result in results.items() if result["success"]],
+        "failed_phases": [phase for phase, result in results.items() if not result["success"]],
+        "subdomains": sorted(subdomains),
+        "count": len(subdomains),
+        "results": results
+    }
+
+# Tool name -> coroutine running it
+TOOL_HANDLERS = {
+    "amass_passive_enum": run_passive_enum,
+    "amass_active_enum": run_active_enum,
+    "amass_intel": run_intel,
+    "amass_full_recon": run_full_recon,
+}
+
 @server.call_tool()
 async def call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
     """Handle tool calls for Amass operations."""
+    handler = TOOL_HANDLERS.get(name)
     
-    if name == "amass_passive_enum":
-        domain = arguments.get("domain")
-        config_file = arguments.get("config_file", "")
-        timeout = arguments.get("timeout", 300)
-        wordlist = arguments.get("wordlist", "")
-        
-        if not domain:
-            return CallToolResult(
-                content=[TextContent(
-                    type="text",
-                    text="Error: Domain parameter is required"
-                )]
-            )
-        
-        # Build the Amass command for passive enumeration
-        command = ["amass", "enum", "-passive", "-d", domain]
-        
-        if config_file:
-            command.extend(["-config", config_file])
-        
-        if wordlist:
-            command.extend(["-w", wordlist])
-        
-        result = await run_amass_command(command, timeout)
-        
+    if handler is None:
         return CallToolResult(
             content=[TextContent(
                 type="text",
-                text=json.dumps(result, indent=2)
+                text=f"Error: Unknown tool '{name}'"
             )]
         )
     
-    elif name == "amass_active_enum":
-        domain = arguments.get("domain")
-        config_file = arguments.get("config_file", "")
-        timeout = arguments.get("timeout", 600)
-        brute_force = arguments.get("brute_force", False)
-        wordlist = arguments.get("wordlist", "")
-        
-        if not domain:
-            return CallToolResult(
-                content=[TextContent(
-                    type="text",
-                    text="Error: Domain parameter is required"
-                )]
-            )
-        
-        # Build the Amass command for active enumeration
-        command = ["amass", "enum", "-active", "-d", domain]
-        
-        if config_file:
-            command.extend(["-config", config_file])
-        
-        if brute_force:
-            command.append("-brute")
-            if wordlist:
-                command.extend(["-w", wordlist])
-        
-        result = await run_amass_command(command, timeout)
-        
+    if not arguments.get("domain"):
         return CallToolResult(
             content=[TextContent(
                 type="text",
-                text=json.dumps(result, indent=2)
+                text="Error: Domain parameter is required"
             )]
         )
     
-    elif name == "amass_intel":
-        domain = arguments.get("domain")
-        whois = arguments.get("whois", True)
-        config_file = arguments.get("config_file", "")
-        
-        if not domain:
-            return CallToolResult(
-                content=[TextContent(
-                    type="text",
-                    text="Error: Domain parameter is required"
-                )]
-            )
-        
-        # Build the Amass command for intelligence gathering
-        command = ["amass", "intel", "-d", domain]
-        
-        if whois:
-            command.append("-whois")
-        
-        if config_file:
-            command.extend(["-config", config_file])
-        
-        result = await run_amass_command(command, 300)
-        
-        return CallToolResult(
-            content=[TextContent(
-                type="text",
-                text=json.dumps(result, indent=2)
-            )]
-        )
+    result = await handler(arguments)
     
-    else:
-        return CallToolResult(
-            content=[TextContent(
-                type="text",
-                text=f"Error: Unknown tool '{name}'"
-            )]
-        )
+    return _json_result(result)
 
 async def main():
     """Main function to run the MCP server."""
@@ -296,4 +547,11 @@ async def main():
         )
 
 if __name__ == "__main__":
+    # uvloop has cheaper callbacks and faster subprocess transports; use it when installed
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     asyncio.run(main())
@@ -3,16 +3,127 @@ Reconnaissance Agent for Subdomain Enumeration
 A CrewAI agent specialized in passive and active subdomain enumeration using Amass MCP server.
 """
 
+import json
 import logging
-from typing import List, Optional, Dict, Any
+import re
+import threading
+from typing import List, Optional, Dict, Any, Tuple
 from crewai import Agent, Task, Crew, Process
 from mcp.config import MCPConfigManager
-from mcp.adapter import MCPManager, ReconnaissanceMCPTools
+from mcp.adapter import CONNECTION_ERRORS, MCPManager, ReconnaissanceMCPTools
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# MCP tool required by each reconnaissance task type
+TASK_TOOLS = {
+    'passive': 'amass_passive_enum',
+    'active': 'amass_active_enum',
+    'intel': 'amass_intel',
+}
+
+# Task prompt templates. The static instructions come first and the
+# filled-in values last, with the domain at the very end, so every run's
+# task prompt starts with the same text and LLM providers can reuse cached
+# prompt prefixes.
+_PASSIVE_TASK_TEMPLATE = (
+    "Perform passive subdomain enumeration on the target domain. "
+    "Use the amass_passive_enum tool to discover subdomains without making "
+    "direct queries to the target. This technique uses public sources like "
+    "search engines, certificate transparency logs, and DNS databases. "
+    "Timeout: {timeout} seconds. "
+    "{config} "
+    "Target domain: '{domain}'."
+)
+
+_PASSIVE_TASK_OUTPUT = (
+    "A comprehensive report containing:\n"
+    "1. List of discovered subdomains\n"
+    "2. Total count of subdomains found\n"
+    "3. Summary of the enumeration process\n"
+    "4. Any errors or warnings encountered\n"
+    "5. Recommendations for further reconnaissance if applicable"
+)
+
+_ACTIVE_TASK_HEADER = (
+    "Perform active subdomain enumeration on the target domain. "
+    "Use the amass_active_enum tool to discover subdomains through direct "
+    "DNS queries and resolution. "
+    "Be aware that active enumeration may be detected by monitoring systems."
+)
+
+_ACTIVE_TASK_OUTPUT = (
+    "A detailed report containing:\n"
+    "1. List of discovered subdomains from active enumeration\n"
+    "2. Total count of subdomains found\n"
+    "3. Comparison with any previous passive enumeration results\n"
+    "4. Analysis of subdomain patterns and potential services\n"
+    "5. Any errors or warnings encountered\n"
+    "6. Security considerations and recommendations"
+)
+
+_INTEL_TASK_TEMPLATE = (
+    "Gather comprehensive intelligence on the target domain. "
+    "Use the amass_intel tool to collect information about the target domain "
+    "including organizational details, IP ranges, and related domains. "
+    "{whois}. "
+    "{config} "
+    "Target domain: '{domain}'."
+)
+
+_INTEL_TASK_OUTPUT = (
+    "An intelligence report containing:\n"
+    "1. Domain ownership and registration information\n"
+    "2. Related domains and subdomains\n"
+    "3. IP address ranges associated with the organization\n"
+    "4. WHOIS data analysis (if enabled)\n"
+    "5. Potential attack surface assessment\n"
+    "6. Recommendations for further investigation"
+)
+
+
+def _config_text(config_file: str) -> str:
+    """Describe the Amass configuration used by a task."""
+    return f'Configuration file: {config_file}.' if config_file else 'Using default configuration.'
+
+
+# Number of subdomains listed in the passive enumeration summary
+PASSIVE_REPORT_PREVIEW = 20
+
+# Subdomain names that commonly point at sensitive or non-production services
+_INTERESTING_SUBDOMAIN_KEYWORDS = r"admin|dev|test|staging|internal|api|mail"
+
+
+def _format_passive_report(domain: str, output: Any) -> str:
+    """Summarize the JSON output of the passive enumeration tool."""
+    try:
+        result = json.loads(output)
+    except (TypeError, ValueError):
+        return f"Passive reconnaissance for {domain}:\n{output}"
+    
+    if not result.get("success"):
+        return f"Passive reconnaissance for {domain} failed: {result.get('error', 'Unknown error')}"
+    
+    # The server returns subdomains already sorted and deduplicated
+    subdomains = result.get("subdomains", [])
+    lines = [f"Passive reconnaissance for {domain}: {len(subdomains)} subdomains found"]
+    lines.extend(f"  - {subdomain}" for subdomain in subdomains[:PASSIVE_REPORT_PREVIEW])
+    if len(subdomains) > PASSIVE_REPORT_PREVIEW:
+        lines.append(f"  ... and {len(subdomains) - PASSIVE_REPORT_PREVIEW} more")
+    
+    # Match only the labels left of the target domain, so a target such as
+    # devices.com does not make every subdomain look interesting
+    interesting_re = re.compile(
+        rf"(?:{_INTERESTING_SUBDOMAIN_KEYWORDS}).*\.{re.escape(domain)}$", re.IGNORECASE
+    )
+    interesting = list(filter(interesting_re.search, subdomains))
+    if interesting:
+        lines.append(f"Potentially interesting subdomains: {len(interesting)}")
+        lines.extend(f"  - {subdomain}" for subdomain in interesting[:PASSIVE_REPORT_PREVIEW])
+    
+    return "\n".join(lines)
+
 
 class ReconnaissanceAgent:
     """
@@ -25,6 +136,34 @@ class ReconnaissanceAgent:
         self.mcp_manager = MCPManager(self.config_manager)
         self.agent = None
         self.tools = []
+        self._agents: Dict[Tuple[int, ...], Tuple[List[Any], Agent]] = {}
+        self._tool_index: Tuple[Optional[List[Any]], Dict[str, Any]] = (None, {})
+        self._crew_lock = threading.Lock()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def connect(self) -> List[Any]:
+        """
+        Connect to the MCP servers and return their tools.
+        
+        The connection is pooled by the MCPManager and reused by subsequent
+        calls until close() is called, so repeated reconnaissance runs do not
+        pay the server start-up cost again.
+        """
+        with ReconnaissanceMCPTools(self.mcp_manager) as tools:
+            return tools
+    
+    def close(self):
+        """Close all MCP server connections held by this agent."""
+        # Waits for an in-flight crew run instead of closing its connection
+        with self._crew_lock:
+            self.mcp_manager.close_all()
+            # Cached agents hold tools bound to the closed connections
+            self._agents.clear()
     
     def create_agent(self, tools: List[Any]) -> Agent:
         """Create the reconnaissance agent with specified tools."""
@@ -45,26 +184,40 @@ class ReconnaissanceAgent:
         )
         return self.agent
     
+    def select_tools(self, tools: List[Any], tasks: List[str]) -> List[Any]:
+        """
+        Select only the tools needed for the requested tasks.
+        
+        Every tool handed to the agent is serialized into each LLM prompt, so
+        tools that no requested task can use are left out.
+        """
+        index = self._index_tools(tools)
+        selected = [
+            index[name] for task, name in TASK_TOOLS.items()
+            if task in tasks and name in index
+        ]
+        
+        # Fall back to the full tool set if the server names its tools differently
+        return selected or tools
+    
+    def _index_tools(self, tools: List[Any]) -> Dict[str, Any]:
+        """Map tool names to tools, reusing the index while the tool list is unchanged."""
+        indexed_tools, index = self._tool_index
+        if indexed_tools is not tools:
+            index = {tool.name: tool for tool in tools}
+            self._tool_index = (tools, index)
+        return index
+    
     def create_passive_enumeration_task(self, domain: str, config_file: str = "", 
                                       timeout: int = 300) -> Task:
         """Create a task for passive subdomain enumeration."""
         return Task(
-            description=(
-                f"Perform passive subdomain enumeration on the domain '{domain}'. "
-                f"Use the amass_passive_enum tool to discover subdomains without making "
-                f"direct queries to the target. This technique uses public sources like "
-                f"search engines, certificate transparency logs, and DNS databases. "
-                f"Timeout: {timeout} seconds. "
-                f"{'Configuration file: ' + config_file if config_file else 'Using default configuration.'}"
-            ),
-            expected_output=(
-                "A comprehensive report containing:\n"
-                "1. List of discovered subdomains\n"
-                "2. Total count of subdomains found\n"
-                "3. Summary of the enumeration process\n"
-                "4. Any errors or warnings encountered\n"
-                "5. Recommendations for further reconnaissance if applicable"
+            description=_PASSIVE_TASK_TEMPLATE.format(
+                domain=domain,
+                timeout=timeout,
+                config=_config_text(config_file)
             ),
+            expected_output=_PASSIVE_TASK_OUTPUT,
             agent=self.agent
         )
     
@@ -72,26 +225,22 @@ class ReconnaissanceAgent:
                                      config_file: str = "", timeout: int = 600,
                                      wordlist: str = "") -> Task:
         """Create a task for active subdomain enumeration."""
+        parts = [_ACTIVE_TASK_HEADER]
+        
+        if not brute_force:
+            parts.append("Disable brute force.")
+        elif wordlist:
+            parts.append(f"Enable brute force enumeration with wordlist: {wordlist}.")
+        else:
+            parts.append("Enable brute force enumeration.")
+        
+        parts.append(f"Timeout: {timeout} seconds.")
+        parts.append(_config_text(config_file))
+        parts.append(f"Target domain: '{domain}'.")
+        
         return Task(
-            description=(
-                f"Perform active subdomain enumeration on the domain '{domain}'. "
-                f"Use the amass_active_enum tool to discover subdomains through direct "
-                f"DNS queries and resolution. "
-                f"{'Enable brute force enumeration with' if brute_force else 'Disable brute force.'} "
-                f"{'wordlist: ' + wordlist if wordlist else ''} "
-                f"Timeout: {timeout} seconds. "
-                f"{'Configuration file: ' + config_file if config_file else 'Using default configuration.'} "
-                f"Be aware that active enumeration may be detected by monitoring systems."
-            ),
-            expected_output=(
-                "A detailed report containing:\n"
-                "1. List of discovered subdomains from active enumeration\n"
-                "2. Total count of subdomains found\n"
-                "3. Comparison with any previous passive enumeration results\n"
-                "4. Analysis of subdomain patterns and potential services\n"
-                "5. Any errors or warnings encountered\n"
-                "6. Security considerations and recommendations"
-            ),
+            description=" ".join(parts),
+            expected_output=_ACTIVE_TASK_OUTPUT,
             agent=self.agent
         )
     
@@ -99,99 +248,138 @@ class ReconnaissanceAgent:
                                config_file: str = "") -> Task:
         """Create a task for domain intelligence gathering."""
         return Task(
-            description=(
-                f"Gather comprehensive intelligence on the domain '{domain}'. "
-                f"Use the amass_intel tool to collect information about the target domain "
-                f"including organizational details, IP ranges, and related domains. "
-                f"{'Include WHOIS information' if whois else 'Exclude WHOIS information'}. "
-                f"{'Configuration file: ' + config_file if config_file else 'Using default configuration.'}"
-            ),
-            expected_output=(
-                "An intelligence report containing:\n"
-                "1. Domain ownership and registration information\n"
-                "2. Related domains and subdomains\n"
-                "3. IP address ranges associated with the organization\n"
-                "4. WHOIS data analysis (if enabled)\n"
-                "5. Potential attack surface assessment\n"
-                "6. Recommendations for further investigation"
+            description=_INTEL_TASK_TEMPLATE.format(
+                domain=domain,
+                whois='Include WHOIS information' if whois else 'Exclude WHOIS information',
+                config=_config_text(config_file)
             ),
+            expected_output=_INTEL_TASK_OUTPUT,
             agent=self.agent
         )
     
+    def run_passive_enumeration(self, domain: str, tools: List[Any],
+                                config_file: str = "", timeout: int = 300) -> str:
+        """Run passive enumeration directly through the MCP tool, bypassing the LLM."""
+        passive_tool = self._index_tools(tools).get(TASK_TOOLS['passive'])
+        if passive_tool is None:
+            raise ValueError(f"Tool '{TASK_TOOLS['passive']}' is not available")
+        
+        logger.info("Running passive enumeration on domain: %s", domain)
+        output = passive_tool.run(domain=domain, config_file=config_file, timeout=timeout)
+        return _format_passive_report(domain, output)
+    
+    def get_agent(self, tools: List[Any]) -> Agent:
+        """
+        Get the agent for a set of tools, creating it on first use.
+        
+        The agent is cached per tool set and reused across runs. The crew is
+        not: each run gets a new Crew so its short-term memory never carries
+        findings from one target domain into the report for another.
+        """
+        key = tuple(id(tool) for tool in tools)
+        cached = self._agents.get(key)
+        if cached is None:
+            # Keep the tools referenced so their ids stay unique while cached
+            cached = self._agents[key] = (tools, self.create_agent(tools))
+        
+        self.agent = cached[1]
+        return self.agent
+    
+    def create_tasks(self, domain: str, tasks: List[str], **task_kwargs) -> List[Task]:
+        """Create the tasks for the requested operations."""
+        task_list = []
+        
+        if 'passive' in tasks:
+            passive_task = self.create_passive_enumeration_task(
+                domain, 
+                task_kwargs.get('config_file', ''),
+                task_kwargs.get('passive_timeout', 300)
+            )
+            task_list.append(passive_task)
+        
+        if 'active' in tasks:
+            active_task = self.create_active_enumeration_task(
+                domain,
+                task_kwargs.get('brute_force', False),
+                task_kwargs.get('config_file', ''),
+                task_kwargs.get('active_timeout', 600),
+                task_kwargs.get('wordlist', '')
+            )
+            task_list.append(active_task)
+        
+        if 'intel' in tasks:
+            intel_task = self.create_intelligence_task(
+                domain,
+                task_kwargs.get('whois', True),
+                task_kwargs.get('config_file', '')
+            )
+            task_list.append(intel_task)
+        
+        if not task_list:
+            raise ValueError("No valid tasks specified")
+        
+        return task_list
+    
     def run_reconnaissance(self, domain: str, tasks: List[str] = None,
                          **task_kwargs) -> Any:
         """
         Run reconnaissance tasks on the specified domain.
         
+        A passive-only run calls the passive enumeration tool directly and
+        returns a plain-text summary without involving the LLM, unless
+        use_llm=True is passed.
+        
         Args:
             domain: Target domain for reconnaissance
             tasks: List of tasks to run ['passive', 'active', 'intel']
             **task_kwargs: Additional arguments for task creation
         
         Returns:
-            Results from the crew execution
+            Results from the crew execution, or the passive summary string
         """
         if tasks is None:
             tasks = ['passive', 'active', 'intel']
         
+        # Reject bad input before touching the shared MCP connection
+        if not any(task in TASK_TOOLS for task in tasks):
+            raise ValueError("No valid tasks specified")
+        
+        tools = self.connect()
+        logger.info("Available tools: %s", [tool.name for tool in tools])
+        
         try:
-            with ReconnaissanceMCPTools(self.mcp_manager) as tools:
-                logger.info(f"Available tools: {[tool.name for tool in tools]}")
-                
-                # Create the agent with available tools
-                agent = self.create_agent(tools)
-                
-                # Create tasks based on requested operations
-                task_list = []
-                
-                if 'passive' in tasks:
-                    passive_task = self.create_passive_enumeration_task(
-                        domain, 
-                        task_kwargs.get('config_file', ''),
-                        task_kwargs.get('passive_timeout', 300)
-                    )
-                    task_list.append(passive_task)
-                
-                if 'active' in tasks:
-                    active_task = self.create_active_enumeration_task(
-                        domain,
-                        task_kwargs.get('brute_force', False),
-                        task_kwargs.get('config_file', ''),
-                        task_kwargs.get('active_timeout', 600),
-                        task_kwargs.get('wordlist', '')
-                    )
-                    task_list.append(active_task)
-                
-                if 'intel' in tasks:
-                    intel_task = self.create_intelligence_task(
-                        domain,
-                        task_kwargs.get('whois', True),
-                        task_kwargs.get('config_file', '')
-                    )
-                    task_list.append(intel_task)
-                
-                if not task_list:
-                    raise ValueError("No valid tasks specified")
-                
-                # Create and run the crew
-                reconnaissance_crew = Crew(
+            if list(tasks) == ['passive'] and not task_kwargs.get('use_llm', False):
+                return self.run_passive_enumeration(
+                    domain,
+                    tools,
+                    task_kwargs.get('config_file', ''),
+                    task_kwargs.get('passive_timeout', 300)
+                )
+            
+            # Reuse the agent for this tool set; the crew is built per run
+            with self._crew_lock:
+                agent = self.get_agent(self.select_tools(tools, tasks))
+                crew = Crew(
                     agents=[agent],
-                    tasks=task_list,
+                    tasks=self.create_tasks(domain, tasks, **task_kwargs),
                     verbose=True,
                     process=Process.sequential,
                     memory=True
                 )
                 
-                logger.info(f"Starting reconnaissance on domain: {domain}")
-                logger.info(f"Tasks to execute: {tasks}")
-                
-                result = reconnaissance_crew.kickoff()
-                
-                logger.info("Reconnaissance completed successfully")
-                return result
+                logger.info("Starting reconnaissance on domain: %s", domain)
+                logger.info("Tasks to execute: %s", tasks)
                 
+                result = crew.kickoff()
+            
+            logger.info("Reconnaissance completed successfully")
+            return result
+            
         except Exception as e:
-            logger.error(f"Error during reconnaissance: {e}")
+            logger.error("Error during reconnaissance: %s", e)
+            if isinstance(e, CONNECTION_ERRORS):
+                # Drop the broken connection so the next run starts a fresh one
+                self.close()
             raise
     
     def list_available_tools(self) -> Dict[str, str]:
@@ -199,6 +387,19 @@ class ReconnaissanceAgent:
         return self.mcp_manager.list_available_servers()
 
 
+_shared_agent: Optional[ReconnaissanceAgent] = None
+_shared_agent_lock = threading.Lock()
+
+
+def get_reconnaissance_agent() -> ReconnaissanceAgent:
+    """Return a process-wide agent whose MCP connection is reused across runs."""
+    global _shared_agent
+    with _shared_agent_lock:
+        if _shared_agent is None:
+            _shared_agent = ReconnaissanceAgent()
+        return _shared_agent
+
+
 def main():
     """Example usage of the Reconnaissance Agent."""
     # Create the reconnaissance agent